@@ -4,6 +4,7 @@ import time
 import logging
 import os
 import json
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime, timedelta
 
 class AirQualityCollector:
@@ -25,7 +26,8 @@ class AirQualityCollector:
         include_raw_concentrations="1", # 1 = Include raw data, 0 = AQI only
         data_type="A",                  # "A" (AQI only), "C" (concentration only), "B" (both)
         batch_days=10,                  # Retrieve data by day increments (suggested less than 30)
-        retry_limit=3                   # Number of retries per request
+        retry_limit=3,                  # Number of retries per request
+        max_workers=2                   # Batches requested concurrently; kept low for AirNow's per-key rate limit
     ):
 
         """
@@ -44,7 +46,10 @@ class AirQualityCollector:
         self.end_date = end_date
         self.batch_days = batch_days
         self.retry_limit = retry_limit
+        self.max_workers = max_workers
         self.all_data = []
+        # Columns of the first batch written, later batches are appended in this order
+        self._saved_columns = None
 
         # setup directories
         script_dir = os.path.dirname(os.path.abspath(__file__))
@@ -98,7 +103,7 @@ class AirQualityCollector:
             start_date (_type_): Start Date
             end_date (_type_): End Date
         Returns:
-            list: aqi data json
+            list: aqi data json, or None if every attempt failed
         """        
         url = self._construct_url(start_date, end_date)
         self.logger.info(f"Requesting data from {start_date.date()} to {end_date.date()}")
@@ -117,16 +122,35 @@ class AirQualityCollector:
                     self.logger.error(f"HTTP {response.status_code}: {response.text}")
             except Exception as e:
                 self.logger.error(f"Error fetching data: {e}")
-            self.logger.info(f"Retrying... Attempt {attempt}/{self.retry_limit}")
-            time.sleep(2)
+            if attempt < self.retry_limit:
+                # Back off exponentially so a rate-limited key gets time to recover
+                self.logger.info(f"Retrying... Attempt {attempt}/{self.retry_limit}")
+                time.sleep(2 ** attempt)
         self.logger.error(f"Failed to retrieve data after {self.retry_limit} attempts.")
-        return []
+        return None
     
-    def save_data(self):
+    def save_data(self, batch_data=None):
         """
         Save the collected data to a CSV file.
+        Args:
+            batch_data (list, optional): Records of one batch to append to the file, rather than
+                                         rewriting everything collected so far.
         """
-        if self.all_data:
+        if batch_data:
+            df = pd.DataFrame(batch_data)
+            first_batch = self._saved_columns is None
+            if first_batch:
+                self._saved_columns = list(df.columns)
+            else:
+                # The header is already written, so columns first seen in a later batch cannot be added
+                dropped = [col for col in df.columns if col not in self._saved_columns]
+                if dropped:
+                    self.logger.warning(f"Dropping columns missing from {self.output_file}'s header: "
+                                        f"{', '.join(map(str, dropped))}")
+            df.reindex(columns=self._saved_columns).to_csv(
+                self.output_file, mode="w" if first_batch else "a", header=first_batch, index=False)
+            self.logger.info(f"Appended {len(df)} records to {self.output_file}")
+        elif self.all_data:
             df = pd.DataFrame(self.all_data)
             df.to_csv(self.output_file, index=False)
             self.logger.info(f"Data saved to {self.output_file}")
@@ -138,15 +162,26 @@ class AirQualityCollector:
         Collect data over the specified date range in batches.
         """
         self.logger.info(f"Starting data collection from {self.start_date.date()} to {self.end_date.date()}")
+        batches = []
         current_date = self.start_date
         while current_date <= self.end_date:
             batch_end_date = min(current_date + timedelta(days=self.batch_days - 1), self.end_date)
-            batch_data = self.fetch_aqs_data(current_date, batch_end_date)
-            if batch_data:
-                self.all_data.extend(batch_data)
-                self.save_data()
-                self.logger.info(f"Saved batch: {current_date.date()} to {batch_end_date.date()}")
+            batches.append((current_date, batch_end_date))
             current_date = batch_end_date + timedelta(days=1)
+        failed_batches = []
+        # Requests are network-bound, so overlap them in threads; map yields results in batch order
+        with ThreadPoolExecutor(max_workers=self.max_workers) as executor:
+            results = executor.map(lambda batch: self.fetch_aqs_data(*batch), batches)
+            for (batch_start_date, batch_end_date), batch_data in zip(batches, results):
+                if batch_data is None:
+                    failed_batches.append(f"{batch_start_date.date()} to {batch_end_date.date()}")
+                elif batch_data:
+                    self.all_data.extend(batch_data)
+                    self.save_data(batch_data)
+                    self.logger.info(f"Saved batch: {batch_start_date.date()} to {batch_end_date.date()}")
+        if failed_batches:
+            self.logger.warning(f"{len(failed_batches)} batches failed and are missing from "
+                                f"{self.output_file}: {', '.join(failed_batches)}")
         self.logger.info("Data collection complete.")
         print(f"Data collection complete. Check logs at {self.log_dir}.")
 
@@ -3,11 +3,33 @@ import pandas as pd
 import numpy as np
 import geopandas as gpd
 import logging
+import functools
 from typing import Optional, List
 from shapely.geometry import Point
 
 
-def derive_county(df, lon_col, lat_col, county_shapefile, final_columns=None):
+@functools.lru_cache(maxsize=None)
+def read_counties(county_shapefile, crs=None):
+    """
+    Reads the county shapefile once per path and CRS; callers share the result and must not modify it.
+
+    Parameters:
+        county_shapefile (str): Path to county shapefile.
+        crs (str, optional): CRS to return the polygons in. Defaults to the file's own CRS.
+
+    Returns:
+        gpd.GeoDataFrame: County polygons, assumed NAD83 (EPSG:4269) if the file carries no CRS.
+    """
+    if crs is not None:
+        counties = read_counties(county_shapefile)
+        # Reproject only when the file is not already in the requested CRS
+        return counties if counties.crs == crs else counties.to_crs(crs)
+    counties = gpd.read_file(county_shapefile)
+    if counties.crs is None:
+        counties = counties.set_crs("EPSG:4269")
+    return counties
+
+def derive_county(df, lon_col, lat_col, county_shapefile, final_columns=None, crs="EPSG:4269"):
     """
     Assigns county names based on latitude and longitude.
     
@@ -16,44 +38,56 @@ def derive_county(df, lon_col, lat_col, county_shapefile, final_columns=None):
         lon_col (str): Longitude column name.
         lat_col (str): Latitude column name.
         county_shapefile (str): Path to county shapefile.
+        crs (str): CRS of the coordinates. Defaults to NAD83, as used by AirNow.
 
     Returns:
         pd.DataFrame: The input DataFrame with a 'County' column added.
     """
     
-    # Convert df to GeoDataFrame
-    gdf = gpd.GeoDataFrame(
-        df,
-        geometry=gpd.points_from_xy(df[lon_col], df[lat_col]),
-        crs="EPSG:4269"
+    # Stations and repeat detections share coordinates, so only join each unique location once
+    locations = df[[lon_col, lat_col]].drop_duplicates()
+    locations_gdf = gpd.GeoDataFrame(
+        locations,
+        geometry=gpd.points_from_xy(locations[lon_col], locations[lat_col]),
+        crs=crs
     )
 
     # Load and prepare counties shapefile
-    counties = gpd.read_file(county_shapefile).to_crs(gdf.crs)
-    # Drop 'index_right' from previous joins if it exists
-    counties = counties.drop(columns=["index_right"], errors="ignore")
-    gdf = gdf.drop(columns=["index_right"], errors="ignore")
+    counties = read_counties(county_shapefile, crs)
 
     # Perform spatial join
-    joined = gpd.sjoin(gdf, counties[["geometry", "NAME"]], how="left", predicate="within")
-
-    # Ensure 'County' column is created correctly
-    if "NAME" in joined.columns:
-        joined.rename(columns={"NAME": "County"}, inplace=True)
-    elif "NAME_left" in joined.columns:
-        joined.rename(columns={"NAME_left": "County"}, inplace=True)
-    elif "NAME_right" in joined.columns:
-        joined.rename(columns={"NAME_right": "County"}, inplace=True)
-    else:
-        joined["County"] = np.nan 
+    located = gpd.sjoin(locations_gdf, counties[["geometry", "NAME"]], how="left", predicate="within")
+    # Keep one county per location if polygons overlap
+    located = located[~located.index.duplicated(keep="first")]
+    county_lookup = located[[lon_col, lat_col, "NAME"]].rename(columns={"NAME": "County"})
 
-    joined.drop(columns=["geometry", "index_right"], errors="ignore", inplace=True)
+    # Broadcast the county names back onto every row
+    joined = df.drop(columns=["County"], errors="ignore").merge(county_lookup, on=[lon_col, lat_col], how="left")
+    joined.index = df.index
 
     if final_columns:
         return joined[final_columns]
     else:
         return joined
 
+def season_of_month(month):
+    """
+    Maps month numbers to meteorological seasons (Dec-Feb Winter, Mar-May Spring, ...).
+
+    Parameters:
+        month (pd.Series): Month numbers 1-12.
+
+    Returns:
+        np.ndarray: Season names, one per month, None where the month is missing.
+    """
+    # Shifting December to 0 makes each season three consecutive integers
+    seasons = np.array(['Winter', 'Spring', 'Summer', 'Fall'], dtype=object)
+    season = np.full(len(month), None, dtype=object)
+    # A NaT date leaves a NaN month, which cannot index the lookup
+    known = month.notna().to_numpy()
+    season[known] = seasons[(month.to_numpy()[known].astype(int) % 12) // 3]
+    return season
+
 class BaseProcessor:
     def __init__(self, output_dir: str):
         self.output_dir = output_dir
@@ -64,8 +98,9 @@ class BaseProcessor:
     def setup_logger(self):
         logger = logging.getLogger(f"{__name__}")
         logger.setLevel(logging.INFO)
-        if logger.hasHandlers():
-            logger.handlers.clear()
+        # Processors share this logger; attach its handlers only for the first one
+        if logger.handlers:
+            return logger
         fh = logging.FileHandler("data/logs/processing.log", mode="a")
         fh.setFormatter(logging.Formatter("%(asctime)s - %(levelname)s - %(message)s"))
         logger.addHandler(fh)
@@ -82,7 +117,7 @@ class WildfireProcessor(BaseProcessor):
         self.end_year = end_year
         self.county_shapefile = county_shapefile
         self.logger.info("Initializing WildfireProcessor.")
-        self.wildfire_df = pd.read_csv(self.wildfire_filepath)
+        self.wildfire_df = pd.read_csv(self.wildfire_filepath, engine="pyarrow")
 
     def clean_dataframe(self, df):
         self.logger.info("Cleaning wildfire data.")
@@ -110,38 +145,28 @@ class WildfireProcessor(BaseProcessor):
         return df
     
     def assign_season(self, df):
-        df['Month'] = pd.to_datetime(df['Date']).dt.month
-        df['Season'] = df['Month'].map({
-            12: 'Winter', 1: 'Winter', 2: 'Winter',
-            3: 'Spring', 4: 'Spring', 5: 'Spring',
-            6: 'Summer', 7: 'Summer', 8: 'Summer',
-            9: 'Fall', 10: 'Fall', 11: 'Fall'
-        })
-        return df
+        month = pd.to_datetime(df['Date']).dt.month
+        return df.assign(Month=month, Season=season_of_month(month))
 
     def filter_to_colorado(self, df):
+        """Keeps wildfire records inside a Colorado county, labelled with that County."""
         self.logger.info("Filtering wildfire records to Colorado boundary.")
-        counties_gdf = gpd.read_file(self.county_shapefile)
-        if counties_gdf.crs is None:
-            counties_gdf.set_crs("EPSG:4269", inplace=True)
-        counties_gdf = counties_gdf.to_crs("EPSG:4326")
-
-        gdf = gpd.GeoDataFrame(
-            df,
-            geometry=gpd.points_from_xy(df["longitude"], df["latitude"]),
-            crs="EPSG:4326"
-        )
-
-        filtered_gdf = gpd.sjoin(gdf, counties_gdf, how="inner", predicate="within")
+        # Cheap bounding-box test first, so only points near Colorado reach the spatial join
+        min_lon, min_lat, max_lon, max_lat = read_counties(self.county_shapefile, "EPSG:4326").total_bounds
+        near = df[df["longitude"].between(min_lon, max_lon) & df["latitude"].between(min_lat, max_lat)]
+        # A record is in Colorado exactly when the county join finds it a county, so one join does both
+        located = derive_county(near, "longitude", "latitude", self.county_shapefile, crs="EPSG:4326")
+        filtered = located[located["County"].notna()]
 
-        self.logger.info(f"Filtered from {len(df)} to {len(filtered_gdf)} records within Colorado.")
-        return filtered_gdf.drop(columns="geometry")
+        self.logger.info(f"Filtered from {len(df)} to {len(filtered)} records within Colorado.")
+        return filtered
 
     def process_wildfire(self, year_range: Optional[tuple] = None):
         self.logger.info("Starting wildfire processing.")
         self.wildfire_df = self.clean_dataframe(self.wildfire_df)
         self.wildfire_df.rename(columns={"acq_date": "Date"}, inplace=True)
-        self.wildfire_df['Date'] = pd.to_datetime(self.wildfire_df['Date'])
+        # FIRMS acq_date is always YYYY-MM-DD; an explicit format skips per-value format inference
+        self.wildfire_df['Date'] = pd.to_datetime(self.wildfire_df['Date'], format="%Y-%m-%d")
         self.wildfire_df['Year'] = self.wildfire_df['Date'].dt.year
 
         if year_range:
@@ -151,23 +176,25 @@ class WildfireProcessor(BaseProcessor):
                 (self.wildfire_df['Year'] <= end_year)
             ]
 
-        self.wildfire_df = self.filter_to_colorado(self.wildfire_df)
         final_columns = [
         "latitude", "longitude", "Date", "frp", "confidence", "type",
         "Year", "Month", "Season", "County"]   
         confidence_filter = "n"
+        # Confidence is a plain row filter, apply it before the spatial join has to look at those rows
         self.wildfire_df = self.filter_confidence_level(self.wildfire_df, confidence_filter)
-        combined_df = []
-        for year in sorted(self.wildfire_df['Year'].unique()):
-            year_df = self.wildfire_df[self.wildfire_df['Year'] == year].copy()
-            year_df = self.assign_season(year_df)
-            year_df = derive_county(year_df, "longitude", "latitude", self.county_shapefile, final_columns=final_columns)
-            year_output_path = os.path.join(self.output_dir, f"wildfire_processed_{year}.csv")
-            year_df.to_csv(year_output_path, index=False)
+        self.wildfire_df = self.filter_to_colorado(self.wildfire_df)
+        # Enrich the whole frame once instead of copying it per year
+        self.wildfire_df = self.assign_season(self.wildfire_df)[final_columns]
+        for year, year_df in self.wildfire_df.groupby('Year'):
+            # Yearly files are intermediate outputs, Feather keeps dtypes and skips text formatting
+            year_output_path = os.path.join(self.output_dir, f"wildfire_processed_{year}.feather")
+            year_df.reset_index(drop=True).to_feather(year_output_path)
             self.logger.info(f"Saved wildfire data for {year} to {year_output_path}.")
-            combined_df.append(year_df)
 
-        combined_df = pd.concat(combined_df)
+        # FIRMS archives are usually already in date order, only sort when they are not
+        combined_df = self.wildfire_df
+        if not combined_df['Year'].is_monotonic_increasing:
+            combined_df = combined_df.sort_values('Year', kind='stable')
         combined_output_path = os.path.join(self.output_dir, f"wildfire_processed_{self.start_year}_{self.end_year}_{confidence_filter}.csv")
         combined_df.to_csv(combined_output_path, index=False)
         self.logger.info(f"Saved combined wildfire data to {combined_output_path}.")
@@ -181,8 +208,11 @@ class AQIProcessor(BaseProcessor):
         self.end_year = end_year
         self.county_shapefile = county_shapefile
         self.logger.info("Initializing AQIProcessor.")
-        self.aq_df = pd.read_csv(self.aqi_filepath)
-        self.wildfire_df = pd.read_csv(self.wildfire_filepath)
+        # Multithreaded Arrow parser for the large raw inputs
+        self.aq_df = pd.read_csv(self.aqi_filepath, engine="pyarrow")
+        self.wildfire_df = pd.read_csv(self.wildfire_filepath, engine="pyarrow")
+        # Parsed once here, wildfire_in_county reuses it for every year
+        self.wildfire_df['Date'] = pd.to_datetime(self.wildfire_df['Date'])
 
     def clean_dataframe(self, df):
         self.logger.info("Cleaning AQI data.")
@@ -190,38 +220,24 @@ class AQIProcessor(BaseProcessor):
         df = df.rename(columns={"UTC": "Date"})
         # Ensure Date is in datetime format
         df["Date"] = pd.to_datetime(df["Date"])
-        df["Year"] = pd.to_datetime(df["Date"]).dt.year
-        df["Month"] = pd.to_datetime(df["Date"]).dt.month
+        df["Year"] = df["Date"].dt.year
+        df["Month"] = df["Date"].dt.month
         return df[["Latitude", "Longitude", "SiteName", "Date", "Month", "Year", "Parameter", "AQI"]]
     
     def categorize_aqi(self, df):
         self.logger.info("Categorizing AQI values.")
-        def category(aqi):
-            if pd.isna(aqi):
-                return "Unknown"
-            elif aqi <= 50:
-                return "Good"
-            elif aqi <= 100:
-                return "Moderate"
-            elif aqi <= 150:
-                return "Unhealthy for Sensitive Groups"
-            elif aqi <= 200:
-                return "Unhealthy"
-            elif aqi <= 300:
-                return "Very Unhealthy"
-            else:
-                return "Hazardous"
-        df["AQI_Category"] = df["AQI"].apply(category)
+        # Upper bound (inclusive) of each EPA category but the last
+        breakpoints = [50, 100, 150, 200, 300]
+        categories = np.array(["Good", "Moderate", "Unhealthy for Sensitive Groups",
+                               "Unhealthy", "Very Unhealthy", "Hazardous"])
+        aqi = df["AQI"].to_numpy(dtype=np.float64)
+        category = categories[np.searchsorted(breakpoints, aqi, side="left")]
+        df["AQI_Category"] = np.where(np.isnan(aqi), "Unknown", category)
         return df
 
     def assign_season(self, df):
         self.logger.info("Assigning seasons.")
-        df["Season"] = df["Month"].map({
-            12: 'Winter', 1: 'Winter', 2: 'Winter',
-            3: 'Spring', 4: 'Spring', 5: 'Spring',
-            6: 'Summer', 7: 'Summer', 8: 'Summer',
-            9: 'Fall', 10: 'Fall', 11: 'Fall'
-        })
+        df["Season"] = season_of_month(df["Month"])
         return df
 
     def compute_rolling_averages(self, df, window_days=7):
@@ -249,12 +265,13 @@ class AQIProcessor(BaseProcessor):
     def wildfire_in_county(self, df):
         """Flags AQI records that fall within the same county and date as wildfires."""
         self.logger.info("Flagging wildfires in the same county and date.")
-        wildfire_dates_counties = self.wildfire_df[['Date', 'County']].drop_duplicates()
-        wildfire_dates_counties['Date'] = pd.to_datetime(wildfire_dates_counties['Date']).dt.date
-        df["Wildfire_In_County"] = df.apply(
-            lambda row: ((wildfire_dates_counties['Date'] == row['Date']).any() and
-                         (wildfire_dates_counties['County'] == row['County']).any()),
-            axis=1)
+        # Compare (day, county) pairs as datetime64[D] keys rather than per-row Python date objects
+        wildfire_days = pd.MultiIndex.from_arrays([
+            self.wildfire_df['Date'].values.astype('datetime64[D]'),
+            self.wildfire_df['County']
+        ])
+        aqi_days = pd.MultiIndex.from_arrays([df['Date'].values.astype('datetime64[D]'), df['County']])
+        df["Wildfire_In_County"] = aqi_days.isin(wildfire_days) & df['County'].notna().to_numpy()
         return df
 
     def process_aqi(self, years_to_process: Optional[List[int]] = None):
@@ -2,9 +2,9 @@ import os
 import pandas as pd
 import geopandas as gpd
 import logging
+import functools
 import matplotlib.pyplot as plt
 import folium
-import webbrowser
 import numpy as np
 import matplotlib.animation as animation
 
@@ -67,34 +67,40 @@ class GeoPlots:
         self.logger.info(f"PM2.5 data path: {pm25_data_path}")
         self.logger.info(f"Ozone data path: {ozone_data_path}")
         self.logger.info(f"Wildfire data path: {wildfire_data_path}")
-        # Load in data
-        self.aqi_pm25 = pd.read_csv(pm25_data_path)
-        self.aqi_ozone = pd.read_csv(ozone_data_path)
-        self.wildfire_data = pd.read_csv(wildfire_data_path)
-        # Date handling
-        self.wildfire_data['acq_date'] = pd.to_datetime(self.wildfire_data['acq_date']).dt.strftime('%Y-%m-%d')
+        # Load in data with the multithreaded Arrow CSV parser
+        self.aqi_pm25 = pd.read_csv(pm25_data_path, engine='pyarrow')
+        self.aqi_ozone = pd.read_csv(ozone_data_path, engine='pyarrow')
+        self.wildfire_data = pd.read_csv(wildfire_data_path, engine='pyarrow')
+        # Date handling, kept as datetime and only formatted where it is displayed
+        self.wildfire_data['acq_date'] = pd.to_datetime(self.wildfire_data['acq_date'])
         # Year filtering
         if start_year and end_year:
             self.aqi_pm25 = self.aqi_pm25[self.aqi_pm25['Year'].between(start_year, end_year)]
             self.aqi_ozone = self.aqi_ozone[self.aqi_ozone['Year'].between(start_year, end_year)]
             self.wildfire_data = self.wildfire_data[self.wildfire_data['Year'].between(start_year, end_year)]
 
+    @functools.cached_property
+    def state_gdf(self):
+        """
+        The state shapefile in WGS84, read once and shared by the plotting methods
+        """
+        return gpd.read_file(self.state_shapefile_path).to_crs(epsg=4326)
+
     def plot_stations(self):
         """
         Plot the air quality monitoring stations on a map of Colorado
         """
         self.logger.info("Plotting air quality monitoring stations.")
-        # Load in state shapefile
-        gdf = gpd.read_file(self.state_shapefile_path)
-        gdf = gdf.to_crs(epsg=4326)
+        # State shapefile
+        gdf = self.state_gdf
         # Start folium map centered on CO
         m = folium.Map(location=[39.5501, -105.7821], zoom_start=6)
         folium.GeoJson(gdf).add_to(m)
         # Plot stations only once
         unique_stations = self.aqi_pm25[['Latitude', 'Longitude']].drop_duplicates()
-        for _, row in unique_stations.iterrows():
+        for row in unique_stations.itertuples(index=False):
             folium.Marker(
-                location=[row['Latitude'], row['Longitude']],
+                location=[row.Latitude, row.Longitude],
                 popup='AQI Station',
                 icon=folium.Icon(color='blue')
             ).add_to(m)
@@ -116,19 +122,27 @@ class GeoPlots:
         Plot the wildfires on a map of Colorado
         """
         self.logger.info("Plotting wildfires.")
-        # Load shapefile
-        gdf = gpd.read_file(self.state_shapefile_path)
-        gdf = gdf.to_crs(epsg=4326)  # Convert to WGS84
+        # State shapefile
+        gdf = self.state_gdf
         # Folium map centered on CO
         m = folium.Map(location=[39.5501, -105.7821], zoom_start=6)
         folium.GeoJson(gdf).add_to(m)
-        # Plot fires
-        for _, row in self.wildfire_data.iterrows():
-            folium.Marker(
-                location=[row['latitude'], row['longitude']],
-                popup='Fire on ' + str(row['acq_date']),
-                icon=folium.Icon(icon='fire', prefix='fa', color='red')
-            ).add_to(m)
+        # Plot fires as one GeoJson layer sharing a single marker template, not a Marker per fire
+        fire_days = self.wildfire_data['acq_date'].dt.strftime('%Y-%m-%d')
+        features = [
+            {
+                "type": "Feature",
+                "geometry": {"type": "Point", "coordinates": [lon, lat]},
+                "properties": {"popup": f"Fire on {day}"}
+            }
+            for lat, lon, day in zip(self.wildfire_data['latitude'].tolist(),
+                                     self.wildfire_data['longitude'].tolist(), fire_days)
+        ]
+        folium.GeoJson(
+            {"type": "FeatureCollection", "features": features},
+            marker=folium.Marker(icon=folium.Icon(icon='fire', prefix='fa', color='red')),
+            popup=folium.GeoJsonPopup(fields=["popup"], labels=False),
+        ).add_to(m)
         bounds = gdf.total_bounds
         m.fit_bounds([[bounds[1], bounds[0]], [bounds[3], bounds[2]]])
         title_html = f"'<h3 align='center' style='font-size:20px'><b>Wildfires in Colorado ({self.wildfire_data['Year'].min()} - {self.wildfire_data['Year'].max()})</b></h3>'"
@@ -146,14 +160,13 @@ class GeoPlots:
         """
         self.logger.info("Plotting timeline.")
         fig, ax = plt.subplots()
-        # Load shapefile
-        gdf = gpd.read_file(self.state_shapefile_path)
-        gdf = gdf.to_crs(epsg=4326)  # Convert to WGS84
+        # State shapefile
+        gdf = self.state_gdf
         gdf.plot(ax=ax, color='white', edgecolor='black')
         # Only plot stations once
         unique_stations = self.aqi_pm25[['Latitude', 'Longitude']].drop_duplicates()
-        for _, row in unique_stations.iterrows():
-            ax.plot(row['Longitude'], row['Latitude'], 'bo')
+        # One Line2D per point set instead of one per point
+        ax.plot(unique_stations['Longitude'], unique_stations['Latitude'], 'bo', linestyle='none')
         bounds = gdf.total_bounds
         ax.set_xlim(bounds[0], bounds[2])
         ax.set_ylim(bounds[1], bounds[3])
@@ -161,18 +174,19 @@ class GeoPlots:
         ax.set_xlabel('Longitude')
         ax.set_ylabel('Latitude')
         # Animate wildfires only using dates with fires
-        dates = self.wildfire_data['acq_date'].unique()
-        for date in dates:
-            print(date)
-            ax.set_title(f'Colorado AQI Stations and Wildfires on {date}')
-            wildfires = self.wildfire_data[self.wildfire_data['acq_date'] == date]
-            for _, row in wildfires.iterrows():
-                ax.plot(row['longitude'], row['latitude'], 'ro')
+        fire_lons = self.wildfire_data['longitude'].to_numpy()
+        fire_lats = self.wildfire_data['latitude'].to_numpy()
+        # Row positions of each date's fires, in order of first appearance
+        fire_rows = self.wildfire_data.groupby('acq_date', sort=False).indices
+        for date, rows in fire_rows.items():
+            date_label = pd.Timestamp(date).strftime('%Y-%m-%d')
+            print(date_label)
+            ax.set_title(f'Colorado AQI Stations and Wildfires on {date_label}')
+            ax.plot(fire_lons[rows], fire_lats[rows], 'ro', linestyle='none')
             plt.pause(0.5)
             ax.clear()
             gdf.plot(ax=ax, color='white', edgecolor='black')
-            for _, row in unique_stations.iterrows():
-                ax.plot(row['Longitude'], row['Latitude'], 'bo')
+            ax.plot(unique_stations['Longitude'], unique_stations['Latitude'], 'bo', linestyle='none')
             ax.set_xlim(bounds[0], bounds[2])
             ax.set_ylim(bounds[1], bounds[3])
         plt.show()
@@ -21,7 +21,12 @@ def skip_if_exists(file_names: List[str]):
             if force_run:
                 self.logger.info(f"Force run enabled: Executing {func.__name__} despite existing files.")
                 return func(self, *args, **kwargs)
-            all_exist = all(os.path.exists(os.path.join(self.output_dir, f)) for f in file_names)
+            # One directory listing instead of a stat call per file
+            try:
+                existing = set(os.listdir(self.output_dir))
+            except FileNotFoundError:
+                existing = set()
+            all_exist = all(f in existing for f in file_names)
             if all_exist:
                 self.logger.info(f"Skipping {func.__name__}: {', '.join(file_names)} already exists.")
                 return
@@ -58,9 +58,13 @@ class WildfireProcessor:
 
     def categorize_confidence(self, df: pd.DataFrame) -> pd.DataFrame:
         self.logger.info("Categorizing confidence levels.")
-        bins = [-np.inf, 30, 80, np.inf]
+        # Right-closed bins (-inf, 30], (30, 80], (80, inf], as pd.cut had them
+        upper_bounds = [30, 80]
         labels = ["Low", "Medium", "High"]
-        df["Confidence_Category"] = pd.cut(df["confidence"], bins=bins, labels=labels)
+        confidence = df["confidence"].to_numpy(dtype=np.float64)
+        codes = np.searchsorted(upper_bounds, confidence, side="left")
+        codes[np.isnan(confidence)] = -1
+        df["Confidence_Category"] = pd.Categorical.from_codes(codes, categories=labels, ordered=True)
         return df
 
     def assign_season(self, df: pd.DataFrame) -> pd.DataFrame:
@@ -87,9 +91,11 @@ class WildfireProcessor:
             crs="EPSG:4326"
         )
         counties = gpd.read_file(self.county_shapefile).to_crs(gdf.crs)
-        joined = gpd.sjoin(gdf, counties, how="left", predicate="within")
         county_name_col = "NAME" if "NAME" in counties.columns else counties.columns[0]
-        df["County"] = joined[county_name_col].values
+        joined = gpd.sjoin(gdf, counties[[county_name_col, "geometry"]], how="left", predicate="within")
+        # A point on a shared border matches several counties; keep one so labels stay row-aligned
+        joined = joined[~joined.index.duplicated(keep="first")]
+        df["County"] = joined[county_name_col].reindex(df.index).values
         return df
 
     def preprocess(self, year_range: Optional[tuple] = None) -> None:
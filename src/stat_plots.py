@@ -1,5 +1,6 @@
 import os
 import pandas as pd
+import numpy as np
 import logging
 import matplotlib.pyplot as plt
 import geopandas as gpd
@@ -64,6 +65,8 @@ class StatPlots:
         self.state_shapefile_path = state_shapefile
         self.conf_level = conf_level
         self.frp_thresh = frp_thresh
+        # Seasonal decompositions keyed by (parameter, county, year)
+        self._decompositions = {}
         # Start logging
         logging.basicConfig(
             filename='data/logs/geo_plots.log',
@@ -75,15 +78,27 @@ class StatPlots:
         self.logger.info(f"PM2.5 data path: {pm25_data_path}")
         self.logger.info(f"Ozone data path: {ozone_data_path}")
         self.logger.info(f"Wildfire data path: {wildfire_data_path}")
-        # Load in data
-        self.aqi_pm25 = pd.read_csv(pm25_data_path)
-        self.aqi_ozone = pd.read_csv(ozone_data_path)
-        self.wildfire_data = pd.read_csv(wildfire_data_path)
+        # Load in data, only the columns used for plotting
+        aqi_columns = ['Date', 'County', 'Year', 'AQI', 'Rolling_AQI']
+        aqi_dtypes = {'AQI': 'float32', 'Rolling_AQI': 'float32'}
+        wildfire_columns = ['Date', 'County', 'Year', 'confidence', 'frp']
+        self.aqi_pm25 = pd.read_csv(pm25_data_path, usecols=aqi_columns, dtype=aqi_dtypes, parse_dates=['Date'])
+        self.aqi_ozone = pd.read_csv(ozone_data_path, usecols=aqi_columns, dtype=aqi_dtypes, parse_dates=['Date'])
+        self.wildfire_data = pd.read_csv(wildfire_data_path, usecols=wildfire_columns, parse_dates=['Date'])
         # Date standardization
-        self.wildfire_data['acq_date'] = pd.to_datetime(self.wildfire_data['Date']).dt.strftime('%Y-%m-%d')
-        self.aqi_pm25['Date'] = pd.to_datetime(self.aqi_pm25['Date'])
-        self.aqi_ozone['Date'] = pd.to_datetime(self.aqi_ozone['Date'])
-        self.wildfire_data['acq_date'] = pd.to_datetime(self.wildfire_data['Date'])
+        self.wildfire_data['acq_date'] = self.wildfire_data['Date']
+        # Store counties as categoricals over the shapefile's names plus any the data spells differently,
+        # so an unmatched name keeps its rows instead of becoming NaN
+        shapefile_counties = gpd.read_file(self.state_shapefile_path)['NAME'].dropna().unique()
+        data_counties = pd.unique(pd.concat([self.aqi_pm25['County'], self.aqi_ozone['County'],
+                                             self.wildfire_data['County']]).dropna())
+        unmatched = sorted(set(data_counties) - set(shapefile_counties))
+        if unmatched:
+            self.logger.warning(f"Counties not in {self.state_shapefile_path}: {', '.join(map(str, unmatched))}")
+        county_dtype = pd.CategoricalDtype(categories=[*shapefile_counties, *unmatched])
+        self.aqi_pm25['County'] = self.aqi_pm25['County'].astype(county_dtype)
+        self.aqi_ozone['County'] = self.aqi_ozone['County'].astype(county_dtype)
+        self.wildfire_data['County'] = self.wildfire_data['County'].astype(county_dtype)
         # Filter with year, conf level or frp threshold if needed
         if start_year and end_year:
             self.aqi_pm25 = self.aqi_pm25[self.aqi_pm25['Year'].between(start_year, end_year)]
@@ -100,17 +115,20 @@ class StatPlots:
         Plots the average AQI for PM2.5 and Ozone over time, with wildfire incidents marked
         """
         fig, ax = plt.subplots(2, 1, figsize=(12, 8))
+        # Daily means of AQI and rolling AQI from a single groupby per parameter
+        pm25_daily = self.aqi_pm25.groupby('Date')[['AQI', 'Rolling_AQI']].mean()
+        ozone_daily = self.aqi_ozone.groupby('Date')[['AQI', 'Rolling_AQI']].mean()
         # Plot AQI from each parameter
-        self.aqi_pm25.groupby('Date')['AQI'].mean().plot(ax=ax[0], title='Average AQI$_{PM2.5}$, All Stations')
-        self.aqi_ozone.groupby('Date')['AQI'].mean().plot(ax=ax[1], title='Average AQI$_{Ozone}$, All Stations')
-        pm25_avg = self.aqi_pm25.groupby('Date')['Rolling_AQI'].mean()
-        ozone_avg = self.aqi_ozone.groupby('Date')['Rolling_AQI'].mean()
-        # Overlay wildfires
-        for _, row in self.wildfire_data.iterrows():
-            if row['acq_date'] in self.aqi_pm25['Date'].values:
-                ax[0].scatter(row['acq_date'], pm25_avg[pm25_avg.index == row['acq_date']].values[0], color='red')
-            if row['acq_date'] in self.aqi_ozone['Date'].values:
-                ax[1].scatter(row['acq_date'], ozone_avg[ozone_avg.index == row['acq_date']].values[0], color='red')
+        pm25_daily['AQI'].plot(ax=ax[0], title='Average AQI$_{PM2.5}$, All Stations')
+        ozone_daily['AQI'].plot(ax=ax[1], title='Average AQI$_{Ozone}$, All Stations')
+        pm25_avg = pm25_daily['Rolling_AQI']
+        ozone_avg = ozone_daily['Rolling_AQI']
+        # Overlay wildfires on the days that have AQI readings
+        fire_dates = self.wildfire_data['acq_date']
+        pm25_fires = fire_dates[fire_dates.isin(pm25_avg.index)]
+        ozone_fires = fire_dates[fire_dates.isin(ozone_avg.index)]
+        ax[0].scatter(pm25_fires, pm25_avg.loc[pm25_fires], color='red')
+        ax[1].scatter(ozone_fires, ozone_avg.loc[ozone_fires], color='red')
         # Labeling
         ax[0].scatter([], [], color='red', label='Fire Incident')
         ax[0].legend()
@@ -128,48 +146,57 @@ class StatPlots:
         # Get unique stations
         counties = self.aqi_ozone['County'].unique()
         fig = make_subplots(rows=1, cols=1)
+        # Pull daily max values for every county in a single pass, then split by county
+        pm25_max = self.aqi_pm25.groupby(['County', 'Date'], observed=True)['Rolling_AQI'].max()
+        ozone_max = self.aqi_ozone.groupby(['County', 'Date'], observed=True)['Rolling_AQI'].max()
+        pm25_by_county = {c: s.droplevel('County') for c, s in pm25_max.groupby(level='County', observed=True, sort=False)}
+        ozone_by_county = {c: s.droplevel('County') for c, s in ozone_max.groupby(level='County', observed=True, sort=False)}
+        wildfires_by_county = dict(list(self.wildfire_data.groupby('County', observed=True, sort=False)))
+        empty_max = pd.Series(dtype=float)
         # Plot AQI from each parameter, uses plotly interactive plots
         for idx, county in enumerate(counties):
-            # Pull daily max values
-            county_pm25 = self.aqi_pm25[self.aqi_pm25['County'] == county].groupby('Date')['Rolling_AQI'].max().reset_index()
-            county_ozone = self.aqi_ozone[self.aqi_ozone['County'] == county].groupby('Date')['Rolling_AQI'].max().reset_index()
-            county_wildfires = self.wildfire_data[self.wildfire_data['County'] == county]
+            county_pm25 = pm25_by_county.get(county, empty_max)
+            county_ozone = ozone_by_county.get(county, empty_max)
+            county_wildfires = wildfires_by_county.get(county)
             # Add plots for each parameter on each unique station, only if the data exists
             if not county_pm25.empty:
                 fig.add_trace(
-                    go.Scatter(x=county_pm25['Date'], y=county_pm25['Rolling_AQI'], mode='lines', name=f'{county} PM2.5',
+                    go.Scatter(x=county_pm25.index, y=county_pm25.values, mode='lines', name=f'{county} PM2.5',
                                visible=(idx == 0), fill='tozeroy'))
             else:
                 fig.add_trace(go.Scatter(x=[], y=[], mode='lines', name=f'{county} PM2.5', visible=(idx == 0)))
 
             if not county_ozone.empty:
                 fig.add_trace(
-                    go.Scatter(x=county_ozone['Date'], y=county_ozone['Rolling_AQI'], mode='lines', name=f'{county} Ozone',
+                    go.Scatter(x=county_ozone.index, y=county_ozone.values, mode='lines', name=f'{county} Ozone',
                                visible=(idx == 0), fill='tozeroy'))
             else:
                 fig.add_trace(go.Scatter(x=[], y=[], mode='lines', name=f'{county} Ozone', visible=(idx == 0)))
 
-            if not county_wildfires.empty:
+            if county_wildfires is not None:
                 wildfire_dates = county_wildfires['acq_date']
-                max_aqi = []
-                for date in wildfire_dates:
-                    pm25_aqi = county_pm25[county_pm25['Date'] == date]['Rolling_AQI'].max() if not county_pm25.empty else 0
-                    ozone_aqi = county_ozone[county_ozone['Date'] == date]['Rolling_AQI'].max() if not county_ozone.empty else 0
-                    max_aqi.append(max(pm25_aqi, ozone_aqi))
+                # Label lookups on the Date-indexed daily maxima instead of masking per wildfire
+                max_aqi = np.maximum(
+                    county_pm25.reindex(wildfire_dates, fill_value=0).to_numpy(),
+                    county_ozone.reindex(wildfire_dates, fill_value=0).to_numpy())
                 fig.add_trace(go.Scatter(x=wildfire_dates, y=max_aqi, mode='markers',
                                          marker=dict(color='black', size=10), name=f'{county} Wildfire',
                                          visible=(idx == 0)))
             else:
                 fig.add_trace(go.Scatter(x=[], y=[], mode='markers', name=f'{county} Wildfire', visible=(idx == 0)))
+        # Year span for the titles, computed once rather than per button
+        start_year = self.aqi_pm25['Date'].min().year
+        end_year = self.aqi_pm25['Date'].max().year
+        n_traces = len(fig.data)
         # Dropdown buttons for county selection
         dropdown_buttons = [
             dict(
                 label=county,
                 method='update',
-                args=[{'visible': [i // 3 == idx for i in range(len(fig.data))],
-                       'showlegend': [i // 3 == idx for i in range(len(fig.data))]},
+                args=[{'visible': [i // 3 == idx for i in range(n_traces)],
+                       'showlegend': [i // 3 == idx for i in range(n_traces)]},
                       {'title': {
-                          'text': f'AQI Time Series for {county}, {self.aqi_pm25["Date"].min().year} to {self.aqi_pm25["Date"].max().year}'}}]
+                          'text': f'AQI Time Series for {county}, {start_year} to {end_year}'}}]
             ) for idx, county in enumerate(counties)
         ]
         fig.update_layout(
@@ -181,7 +208,7 @@ class StatPlots:
                     xanchor='left',
                     y=1,
                     yanchor='top')],
-            title=f'AQI between {self.aqi_pm25["Date"].min().year} and {self.aqi_pm25["Date"].max().year}',
+            title=f'AQI between {start_year} and {end_year}',
             xaxis_title='Date',
             yaxis_title='AQI',
             width=1000,
@@ -194,6 +221,14 @@ class StatPlots:
                 range=[0, 250]))
         fig.show()
 
+    def _decompose(self, series, key, period=128):
+        """
+        Additive seasonal decomposition of a daily AQI series, cached by key so repeated plots are not recomputed
+        """
+        if key not in self._decompositions:
+            self._decompositions[key] = sm.tsa.seasonal_decompose(series, model='additive', period=period)
+        return self._decompositions[key]
+
     def timeseries_processing(self, county=None, year=None):
         """
         Decomposes the time series data for PM2.5 and Ozone AQI for a given county and year
@@ -214,7 +249,7 @@ class StatPlots:
         if pm25_max.empty:
             print(f"No PM2.5 data available for {county} in {year}")
         else:
-            pm25_decomposition = sm.tsa.seasonal_decompose(pm25_max, model='additive', period=128)
+            pm25_decomposition = self._decompose(pm25_max, ('PM2.5', county, year))
             fig, (ax1, ax2, ax3, ax4) = plt.subplots(4, 1, figsize=(12, 10))
             pm25_decomposition.observed.plot(ax=ax1, title='Observed PM2.5 AQI')
             pm25_decomposition.trend.plot(ax=ax2, title='Trend')
@@ -226,7 +261,7 @@ class StatPlots:
         if ozone_max.empty:
             print(f"No Ozone data available for {county} in {year}")
         else:
-            ozone_decomposition = sm.tsa.seasonal_decompose(ozone_max, model='additive', period=128)
+            ozone_decomposition = self._decompose(ozone_max, ('Ozone', county, year))
             fig, (ax1, ax2, ax3, ax4) = plt.subplots(4, 1, figsize=(12, 10))
             ozone_decomposition.observed.plot(ax=ax1, title='Observed Ozone AQI')
             ozone_decomposition.trend.plot(ax=ax2, title='Trend')
@@ -239,7 +274,7 @@ if __name__ == "__main__":
     ozone_dp = 'data/aqi_data/aqi_processed/ozone_aqi_2019_2024.csv'
     pm25_dp = 'data/aqi_data/aqi_processed/pm25_aqi_2019_2024.csv'
     wildfire_dp = 'data/wildfire_data/wildfire_processed/wildfire_processed_2019_2024_n.csv'
-    state_shapefile = 'data/co_shapefile/counties/counties_19.shSp'
+    state_shapefile = 'data/co_shapefile/counties/counties_19.shp'
     # Example usage for 2019-2024 data, with a focus on the Larmier county wildfires in 2020
     stat_plots = StatPlots(ozone_dp, pm25_dp, wildfire_dp, state_shapefile, 2019, 2024, frp_thresh=40)
     stat_plots.station_timeseries_plots()
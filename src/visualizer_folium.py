@@ -1,19 +1,186 @@
 import os
+import gzip
+import json
 import logging
+import numpy as np
 import pandas as pd
 import folium
-import webbrowser
-from folium.plugins import HeatMap, HeatMapWithTime, TimestampedGeoJson, MarkerCluster
-import matplotlib.pyplot as plt
+from folium.plugins import HeatMap, HeatMapWithTime, TimestampedGeoJson, FastMarkerCluster
+from matplotlib.figure import Figure
+from matplotlib.backends.backend_agg import FigureCanvasAgg
 from io import BytesIO
 import base64
+import functools
+import hashlib
+import html
+from concurrent.futures import ProcessPoolExecutor
+import multiprocessing
+import weakref
+
+# Define color map for your AQI_Category
+aqi_color_map = {
+    "Good": "#00e400",
+    "Moderate": "#ffff00",
+    "Unhealthy for Sensitive Groups": "#ff7e00",
+    "Unhealthy": "#ff0000",
+    "Very Unhealthy": "#8f3f97",
+    "Hazardous": "#7e0023",
+    "Unknown": "#000000"
+}
+
+def _new_popup_axes():
+    """Create popup plot axes on a bare Agg-rendered Figure, outside pyplot's state."""
+    fig = Figure(figsize=(8, 6), dpi=100)
+    # Bind the Agg canvas up front so savefig does not swap canvases on every call
+    FigureCanvasAgg(fig)
+    return fig.subplots()
+
+def _render_time_series_html(station_name, dates, aqis, ax=None):
+    """Plot a station's AQI series as a base64 PNG embedded in HTML, redrawing on ax if given."""
+    if ax is None:
+        ax = _new_popup_axes()
+    else:
+        ax.clear()
+    fig = ax.figure
+
+    # Add AQI threshold bands
+    ax.axhspan(0, 50, facecolor="#00e400", alpha=0.3)     
+    ax.axhspan(50, 100, facecolor="#ffff00", alpha=0.3)    
+    ax.axhspan(100, 150, facecolor="#ff7e00", alpha=0.3)   
+    ax.axhspan(150, 200, facecolor="#ff0000", alpha=0.3)   
+    ax.axhspan(200, 300, facecolor="#8f3f97", alpha=0.3)   
+    ax.axhspan(300, 500, facecolor="#7e0023", alpha=0.3)   
+    
+    ax.plot(dates, aqis, marker='o', linestyle='-', color="black")
+    ax.set_title(station_name, fontsize=18)
+    ax.set_xlabel("Date", fontsize=14)
+    ax.set_ylabel("AQI", fontsize=14)
+    ax.grid(True)
+    ax.set_ylim(0,250)
+    fig.tight_layout()
+
+    buf = BytesIO()
+    fig.savefig(buf, format='png', bbox_inches='tight')
+    buf.seek(0)
+    image_base64 = base64.b64encode(buf.getvalue()).decode('utf-8')
+    return f'<img src="data:image/png;base64,{image_base64}" style="width:100%; height:auto;">'
+
+def _reuse_built_map(create_map):
+    """Build each map once per year_filter, remembering only where it was saved.
+
+    The decorated method returns (map, saved_path), and the first call returns the
+    folium.Map. Later calls return the saved path while that file still exists, and
+    rebuild the map if it was deleted, so no built Map stays in memory. The loaded
+    frames are treated as read-only after __init__; call clear_built_maps() after
+    changing them.
+    """
+    @functools.wraps(create_map)
+    def wrapper(self, year_filter=None):
+        # 2020 and "2020" name the same year
+        if year_filter is not None:
+            year_filter = int(year_filter)
+        key = (create_map.__name__, year_filter)
+        saved_path = self._built_maps.get(key)
+        if saved_path is not None and os.path.exists(saved_path):
+            self.logger.info(f"Reusing {create_map.__name__} output {saved_path} for year_filter={year_filter}.")
+            return saved_path
+        m, self._built_maps[key] = create_map(self, year_filter)
+        return m
+    return wrapper
+
+def _binned_heat_data(coords, decimals=4):
+    """Collapse (lat, lon) points onto a grid of the given decimals as [lat, lon, count] heatmap rows.
+
+    Four decimals is roughly a 10 m cell, so only detections at (nearly) the same spot
+    merge. The grid does not follow zoom, and a coarser one shows up as a lattice of
+    dots once the 15 px radius is smaller than a cell, around city zoom for 1 km cells.
+    """
+    cells, counts = np.unique(np.round(coords, decimals), axis=0, return_counts=True)
+    return np.column_stack([cells, counts]).tolist()
+
+# EPA AQI bands (lower, upper, color) drawn behind the popup plots
+aqi_bands = [
+    (0, 50, "#00e400"),
+    (50, 100, "#ffff00"),
+    (100, 150, "#ff7e00"),
+    (150, 200, "#ff0000"),
+    (200, 300, "#8f3f97"),
+    (300, 500, "#7e0023"),
+]
+
+def _render_time_series_svg(station_name, dates, aqis, width=800, height=600, aqi_max=250):
+    """Draw the same popup plot as _render_time_series_html as inline SVG, without Matplotlib."""
+    left, right, top, bottom = 70, 20, 50, 60
+    plot_w, plot_h = width - left - right, height - top - bottom
+
+    # Scale dates and AQI to pixel coordinates in one pass each
+    t = dates.astype('datetime64[ns]').astype(np.int64)
+    t_span = t[-1] - t[0] if len(t) > 1 else 0
+    xs = left + (plot_w * (t - t[0]) / t_span if t_span else np.full(len(t), plot_w / 2))
+    ys = top + plot_h * (1 - np.asarray(aqis, dtype=np.float64) / aqi_max)
+
+    def y_px(aqi):
+        return top + plot_h * (1 - min(aqi, aqi_max) / aqi_max)
+
+    # Inline popups share one document, so each plot needs its own clip-path id
+    series = np.asarray(dates).tobytes() + np.asarray(aqis).tobytes()
+    clip_id = "plot-" + hashlib.blake2b(str(station_name).encode('utf-8') + series, digest_size=8).hexdigest()
+
+    parts = [
+        f'<svg xmlns="http://www.w3.org/2000/svg" viewBox="0 0 {width} {height}" style="width:100%; height:auto;" '
+        'font-family="sans-serif">',
+        f'<defs><clipPath id="{clip_id}"><rect x="{left}" y="{top}" width="{plot_w}" height="{plot_h}"/></clipPath></defs>',
+    ]
+    for lower, upper, color in aqi_bands:
+        if lower < aqi_max:
+            parts.append(f'<rect x="{left}" y="{y_px(upper):.1f}" width="{plot_w}" '
+                         f'height="{y_px(lower) - y_px(upper):.1f}" fill="{color}" fill-opacity="0.3"/>')
+    for tick in range(0, aqi_max + 1, 50):
+        parts.append(f'<line x1="{left}" x2="{left + plot_w}" y1="{y_px(tick):.1f}" y2="{y_px(tick):.1f}" stroke="#b0b0b0"/>')
+        parts.append(f'<text x="{left - 8}" y="{y_px(tick) + 4:.1f}" font-size="12" text-anchor="end">{tick}</text>')
+    if len(t):
+        tick_idx = np.unique(np.linspace(0, len(t) - 1, 5).astype(int))
+        for label, x in zip(np.datetime_as_string(dates[tick_idx], unit='D'), xs[tick_idx]):
+            parts.append(f'<text x="{x:.1f}" y="{top + plot_h + 20}" font-size="12" text-anchor="middle">{label}</text>')
+    points = " ".join(f"{x:.1f},{y:.1f}" for x, y in zip(xs, ys))
+    parts.append(f'<g clip-path="url(#{clip_id})"><polyline points="{points}" fill="none" stroke="black" stroke-width="1.5"/>')
+    parts.extend(f'<circle cx="{x:.1f}" cy="{y:.1f}" r="3"/>' for x, y in zip(xs, ys))
+    parts.append('</g>')
+    parts.append(f'<rect x="{left}" y="{top}" width="{plot_w}" height="{plot_h}" fill="none" stroke="black"/>')
+    parts.append(f'<text x="{left + plot_w / 2}" y="{top - 15}" font-size="18" text-anchor="middle">'
+                 f'{html.escape(str(station_name))}</text>')
+    parts.append(f'<text x="{left + plot_w / 2}" y="{height - 15}" font-size="14" text-anchor="middle">Date</text>')
+    parts.append(f'<text x="18" y="{top + plot_h / 2}" font-size="14" text-anchor="middle" '
+                 f'transform="rotate(-90 18 {top + plot_h / 2})">AQI</text>')
+    parts.append('</svg>')
+    return "".join(parts)
+
+_worker_axes = None
+
+def _render_station_popup(task):
+    """Process pool entry point: render one (station_name, dates, aqis) task on this process's figure."""
+    global _worker_axes
+    if _worker_axes is None:
+        _worker_axes = _new_popup_axes()
+    station_name, dates, aqis = task
+    return _render_time_series_html(station_name, dates, aqis, ax=_worker_axes)
 
 class Visualizer:
-    def __init__(self, aqi_pm25_path, aqi_ozone_path, wildfire_data_path, output_dir='visuals'):
+    def __init__(self, aqi_pm25_path, aqi_ozone_path, wildfire_data_path, output_dir='visuals', compress_maps=False,
+                 popup_format='png', load_year=None):
         self.aqi_pm25_path = aqi_pm25_path
         self.aqi_ozone_path = aqi_ozone_path
         self.wildfire_data_path = wildfire_data_path
         self.output_dir = output_dir
+        self.compress_maps = compress_maps
+        # 'png' renders station popups with Matplotlib, 'svg' draws them as lightweight inline SVG
+        self.popup_format = popup_format
+        self._built_maps = {}
+        # Rendered popup HTML keyed by station name and a digest of its (Date, AQI) series
+        self._popup_cache = {}
+        # Process pool for PNG popups, started on the first large batch and reused after that
+        self._popup_pool = None
+        self._popup_pool_finalizer = None
         os.makedirs(self.output_dir, exist_ok=True)
 
         # Setup logging
@@ -26,48 +193,153 @@ class Visualizer:
         self.logger.info("Visualizer initialized.")
 
         # Load Data
-        self.aqi_pm25 = pd.read_csv(aqi_pm25_path)
-        self.aqi_ozone = pd.read_csv(aqi_ozone_path)
-        self.wildfire_data = pd.read_csv(wildfire_data_path)
+        # Only the columns the maps use
+        aqi_columns = ['SiteName', 'Latitude', 'Longitude', 'Date', 'AQI', 'AQI_Category', 'Season']
+        wildfire_columns = ['latitude', 'longitude', 'Date', 'Season']
+        # load_year keeps only that year's rows in memory, for machines that cannot hold every year
+        self.aqi_pm25 = self._load_cached(aqi_pm25_path, aqi_columns, load_year)
+        self.aqi_ozone = self._load_cached(aqi_ozone_path, aqi_columns, load_year)
+        self.wildfire_data = self._load_cached(wildfire_data_path, wildfire_columns, load_year)
 
         # Ensure column names are strings
         self.aqi_pm25.columns = self.aqi_pm25.columns.astype(str)
         self.aqi_ozone.columns = self.aqi_ozone.columns.astype(str)
         self.wildfire_data.columns = self.wildfire_data.columns.astype(str)
 
-        # Convert 'Date' to string format (YYYY-MM-DD)
-        self.wildfire_data['Date'] = pd.to_datetime(self.wildfire_data['Date'], errors='coerce').dt.strftime('%Y-%m-%d')
-        self.aqi_pm25["Date"] = pd.to_datetime(self.aqi_pm25["Date"], errors='coerce').dt.strftime('%Y-%m-%d')
-        self.aqi_ozone["Date"] = pd.to_datetime(self.aqi_ozone["Date"], errors='coerce').dt.strftime('%Y-%m-%d')
-
         # Drop rows missing essential values
         self.wildfire_data.dropna(subset=['latitude', 'longitude', 'Date'], inplace=True)
-        self.aqi_pm25.dropna(subset=['Latitude', 'Longitude', 'AQI'], inplace=True)
-        self.aqi_ozone.dropna(subset=['Latitude', 'Longitude', 'AQI'], inplace=True)
+        self.aqi_pm25.dropna(subset=['Latitude', 'Longitude', 'Date', 'AQI'], inplace=True)
+        self.aqi_ozone.dropna(subset=['Latitude', 'Longitude', 'Date', 'AQI'], inplace=True)
+
+        # Store categories as codes over aqi_color_map's keys; anything unrecognized becomes Unknown
+        aqi_category_dtype = pd.CategoricalDtype(list(aqi_color_map))
+        for df in (self.aqi_pm25, self.aqi_ozone):
+            if 'AQI_Category' in df:
+                df['AQI_Category'] = df['AQI_Category'].astype(aqi_category_dtype).fillna("Unknown")
+
+        # Sort by date once so year filters can slice by position
+        for df in (self.wildfire_data, self.aqi_pm25, self.aqi_ozone):
+            df.sort_values('Date', inplace=True)
+            df.reset_index(drop=True, inplace=True)
+        self._wildfire_dates = self.wildfire_data['Date'].values
+        self._pm25_dates = self.aqi_pm25['Date'].values
+        self._ozone_dates = self.aqi_ozone['Date'].values
+
+    def _load_cached(self, csv_path, columns, load_year=None):
+        """Load the available columns of a CSV through a Parquet copy next to it, rebuilt whenever the CSV is newer.
+
+        The cache name carries a digest of the requested columns and their dtypes, so
+        changing either builds a new copy instead of reusing one laid out differently.
+        With load_year set, only that year's rows are returned; from the cache they are
+        filtered inside the Parquet reader, so the other years are never materialized.
+        Any cache read or write error falls back to the CSV.
+        """
+        # Map coordinates and AQI only need float32 precision
+        float_columns = ['Latitude', 'Longitude', 'AQI', 'latitude', 'longitude']
+        layout = json.dumps([columns, [col for col in float_columns if col in columns], 'float32'])
+        digest = hashlib.blake2b(layout.encode('utf-8'), digest_size=4).hexdigest()
+        cache_path = f"{os.path.splitext(csv_path)[0]}.{digest}.parquet"
+        date_filters = None
+        if load_year:
+            year = int(load_year)
+            date_filters = [('Date', '>=', pd.Timestamp(f'{year}-01-01')),
+                            ('Date', '<', pd.Timestamp(f'{year + 1}-01-01'))]
+        if os.path.exists(cache_path) and os.path.getmtime(cache_path) >= os.path.getmtime(csv_path):
+            self.logger.info(f"Loading cached data from {cache_path}.")
+            try:
+                return pd.read_parquet(cache_path, filters=date_filters)
+            except Exception as e:
+                self.logger.warning(f"Could not read {cache_path}, loading {csv_path} instead: {e}")
+        # Multithreaded Arrow parser for the one-off CSV read; later loads hit the Parquet copy
+        header = pd.read_csv(csv_path, nrows=0).columns
+        usecols = [col for col in columns if col in header]
+        df = pd.read_csv(csv_path, engine='pyarrow', usecols=usecols,
+                         dtype={col: 'float32' for col in float_columns if col in usecols})
+        # Dates are written by the processors as ISO strings; a no-op if Arrow already parsed them
+        df['Date'] = pd.to_datetime(df['Date'], format='ISO8601', errors='coerce')
+        # Write beside the cache and move it into place, so an interrupted write never looks fresh
+        tmp_path = f"{cache_path}.{os.getpid()}.tmp"
+        try:
+            df.to_parquet(tmp_path, index=False)
+            os.replace(tmp_path, cache_path)
+            self.logger.info(f"Cached {csv_path} to {cache_path}.")
+        except Exception as e:
+            # The cache is only a speed-up; a read-only or full disk should not stop the maps
+            self.logger.warning(f"Could not cache {csv_path} to {cache_path}: {e}")
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
+        if date_filters:
+            df = df[(df['Date'] >= date_filters[0][2]) & (df['Date'] < date_filters[1][2])].reset_index(drop=True)
+        return df
+
+    def _wildfire_coords_of(self, wf_df):
+        """Return the (lat, lon) rows of a wildfire frame as a float64 array.
+
+        Five decimals (about 1 m) keep the embedded JSON short, since float32 values print with ~15 digits.
+        """
+        return np.round(wf_df[['latitude', 'longitude']].to_numpy(dtype=np.float64), 5)
+
+    def _year_slice(self, df, dates, year_filter):
+        """Return the rows of a date-sorted frame that fall in year_filter."""
+        year = int(year_filter)
+        lo = np.searchsorted(dates, np.datetime64(f'{year}-01-01'))
+        hi = np.searchsorted(dates, np.datetime64(f'{year + 1}-01-01'))
+        return df.iloc[lo:hi]
+
+    def clear_built_maps(self):
+        """Forget the maps built so far, so the next create_* call rebuilds from the current data.
+
+        Replaced frames must still be sorted by Date, which the year filters rely on.
+        """
+        self._built_maps.clear()
+        self._wildfire_dates = self.wildfire_data['Date'].values
+        self._pm25_dates = self.aqi_pm25['Date'].values
+        self._ozone_dates = self.aqi_ozone['Date'].values
+
+    def _save_map(self, m, map_path):
+        """Write the rendered map and return its path, gzipped as map_path + '.gz' if compress_maps is set.
+
+        The page is streamed from its Jinja template into the file, so the full HTML is
+        never held as one string; if branca's internals change, it falls back to render().
+        """
+        root = m.get_root()
+        template = getattr(root, '_template', None)
+        children = getattr(root, '_children', None)
+        if template is not None and hasattr(template, 'stream') and children is not None:
+            # Same steps as Figure.render(): children fill the header, body and script
+            # sections, then the page template joins them, here piece by piece into f
+            for child in children.values():
+                child.render()
+            write_page = template.stream(this=root, kwargs={}).dump
+        else:
+            page = root.render()
+            def write_page(f):
+                f.write(page)
+        if self.compress_maps:
+            map_path += '.gz'
+            with gzip.open(map_path, 'wt', encoding='utf-8', compresslevel=3) as f:
+                write_page(f)
+        else:
+            with open(map_path, 'w', encoding='utf-8') as f:
+                write_page(f)
+        return map_path
 
     # -------------------------------------------------------------------------
     # Existing Methods
     # -------------------------------------------------------------------------
     def add_wildfire_full_year_heatmap(self, m, filtered_wildfires):
         """Add a static full-year wildfire heatmap to the map."""
-        wf_coords = filtered_wildfires[['latitude', 'longitude']].values.tolist()
-        wf_coords = [[float(lat), float(lon)] for lat, lon in wf_coords]
-        HeatMap(wf_coords, radius=15, blur=10, 
+        heat_data = _binned_heat_data(self._wildfire_coords_of(filtered_wildfires))
+        HeatMap(heat_data, radius=15, blur=10, 
                 gradient={"0.2": "yellow", "0.4": "orange", "0.6": "red"}).add_to(m)
     
     def add_wildfire_animated_heatmap(self, m, filtered_wildfires):
         """Group wildfire data by month and add an animated heatmap."""
-        wf = filtered_wildfires.copy()
-        wf['Date'] = pd.to_datetime(wf['Date'])
-        wf['Month'] = wf['Date'].dt.strftime('%Y-%m')
-        unique_months = sorted(wf['Month'].unique())
-        unique_months_iso = [pd.to_datetime(month + "-01").isoformat() for month in unique_months]
-        
-        wildfire_data_by_month = []
-        for month in unique_months:
-            coords = wf[wf['Month'] == month][['latitude', 'longitude']].values.tolist()
-            coords = [[float(lat), float(lon)] for lat, lon in coords]
-            wildfire_data_by_month.append(coords)
+        wf_coords = self._wildfire_coords_of(filtered_wildfires)
+        month_indices = filtered_wildfires.groupby(filtered_wildfires['Date'].dt.to_period('M')).indices
+        unique_months = sorted(month_indices)
+        unique_months_iso = [month.to_timestamp().isoformat() for month in unique_months]
+        wildfire_data_by_month = [wf_coords[month_indices[month]].tolist() for month in unique_months]
         hm_time = HeatMapWithTime(
             data=wildfire_data_by_month,
             index=unique_months_iso,
@@ -79,129 +351,153 @@ class Visualizer:
         hm_time.add_to(m)
 
     def add_wildfire_cluster_numbered(self, m, filtered_wildfires):
-        """Add wildfire markers as a numbered cluster using MarkerCluster."""
-        coords = filtered_wildfires[['latitude', 'longitude']].values.tolist()
-        coords = [[float(lat), float(lon)] for lat, lon in coords]
-        marker_cluster = MarkerCluster(name="Wildfire Cluster")
-        for lat, lon in coords:
-            folium.Marker(location=[lat, lon]).add_to(marker_cluster)
-        marker_cluster.add_to(m)
-
-    def generate_time_series_html(self, data, station_name):
-        """Generate a time series plot for a station as a base64 PNG embedded in HTML."""
-        data['Date'] = pd.to_datetime(data['Date'])
-        data = data.sort_values('Date')
-
-        fig, ax = plt.subplots(figsize=(8, 6), dpi=100)
-
-        # Add AQI threshold bands
-        ax.axhspan(0, 50, facecolor="#00e400", alpha=0.3)     
-        ax.axhspan(50, 100, facecolor="#ffff00", alpha=0.3)    
-        ax.axhspan(100, 150, facecolor="#ff7e00", alpha=0.3)   
-        ax.axhspan(150, 200, facecolor="#ff0000", alpha=0.3)   
-        ax.axhspan(200, 300, facecolor="#8f3f97", alpha=0.3)   
-        ax.axhspan(300, 500, facecolor="#7e0023", alpha=0.3)   
-        
-        ax.plot(data['Date'], data['AQI'], marker='o', linestyle='-', color="black")
-        ax.set_title(station_name, fontsize=18)
-        ax.set_xlabel("Date", fontsize=14)
-        ax.set_ylabel("AQI", fontsize=14)
-        ax.grid(True)
-        ax.set_ylim(0,250)
-        fig.tight_layout()
-
-        buf = BytesIO()
-        plt.savefig(buf, format='png', bbox_inches='tight')
-        buf.seek(0)
-        image_base64 = base64.b64encode(buf.getvalue()).decode('utf-8')
-        plt.close(fig)
-        return f'<img src="data:image/png;base64,{image_base64}" style="width:100%; height:auto;">'
+        """Add wildfire markers as a numbered cluster using FastMarkerCluster.
 
-    def add_static_aqi_station_markers(self, m, filtered_pm25, filtered_ozone):
-        """Add static circle markers for AQI stations with time series popups."""
-        grouped_pm25 = filtered_pm25.groupby(['SiteName', 'Latitude', 'Longitude'])
-        for (site, lat, lon), group in grouped_pm25:
-            popup_html = self.generate_time_series_html(group.copy(), site)
-            iframe = folium.IFrame(html=popup_html, width=500, height=400)
-            popup = folium.Popup(iframe, max_width=600)
-            folium.CircleMarker(
-                location=[float(lat), float(lon)],
-                radius=6,
-                color="blue",
-                fill=True,
-                fill_color="black",
-                fill_opacity=0.5,
-                popup=popup
-            ).add_to(m)
-
-        grouped_ozone = filtered_ozone.groupby(['SiteName', 'Latitude', 'Longitude'])
-        for (site, lat, lon), group in grouped_ozone:
-            popup_html = self.generate_time_series_html(group.copy(), site)
-            iframe = folium.IFrame(html=popup_html, width=500, height=400)
-            popup = folium.Popup(iframe, max_width=600)
-            folium.CircleMarker(
-                location=[float(lat), float(lon)],
-                radius=6,
-                color="green",
-                fill=True,
-                fill_color="black",
-                fill_opacity=0.5,
-                popup=popup
-            ).add_to(m)
-        
-    def add_animated_aqi_markers(self, m, filtered_pm25, filtered_ozone):
-        """Add animated AQI markers using TimestampedGeoJson (monthly)."""
-        features = []
-        def get_station_name(row):
-            return row.get('SiteName', f"Station at ({row['Latitude']}, {row['Longitude']})")
-    
-        # PM2.5
-        for idx, row in filtered_pm25.iterrows():
-            try:
-                date_obj = pd.to_datetime(row['Date']).replace(day=1)
-            except Exception:
-                continue
-            time_str = date_obj.isoformat()
-            color = aqi_color_map.get(row.get('AQI_Category', "Unknown"), "#000000")
-            station_name = get_station_name(row)
-            feature = {
+        The points are embedded as one coordinate array and the markers are created
+        in the browser, rather than emitting a separate Marker object per wildfire.
+        """
+        coords = self._wildfire_coords_of(filtered_wildfires).tolist()
+        FastMarkerCluster(coords, name="Wildfire Cluster").add_to(m)
+
+    def generate_time_series_html(self, data, station_name, ax=None):
+        """Generate a time series plot for a station as a base64 PNG embedded in HTML.
+
+        Expects data already in Date order, which groups of the date-sorted frames are.
+        Pass ax to redraw on an existing figure instead of creating one per station.
+        """
+        return _render_time_series_html(station_name, data['Date'].to_numpy(), data['AQI'].to_numpy(), ax=ax)
+
+    def _station_popups(self, frames):
+        """Render the popup plot of every station in each frame, all in one process pool.
+
+        Returns one list of (lat, lon, popup_html) per frame, in station order.
+        """
+        stations = []
+        tasks = []
+        for frame_idx, df in enumerate(frames):
+            # Slice two column arrays by group positions rather than materializing a sub-frame per station
+            dates = df['Date'].to_numpy()
+            aqis = df['AQI'].to_numpy()
+            station_rows = df.groupby(['SiteName', 'Latitude', 'Longitude']).indices
+            for (site, lat, lon), rows in sorted(station_rows.items()):
+                stations.append((frame_idx, lat, lon))
+                tasks.append((site, dates[rows], aqis[rows]))
+
+        # A station whose series was already drawn (e.g. by another map) reuses that popup
+        keys = [
+            (site, hashlib.blake2b(station_dates.tobytes() + station_aqis.tobytes(), digest_size=16).digest())
+            for site, station_dates, station_aqis in tasks
+        ]
+        pending = {key: task for key, task in zip(keys, tasks) if key not in self._popup_cache}
+        if self.popup_format == 'svg':
+            rendered = [_render_time_series_svg(*task) for task in pending.values()]
+        elif len(pending) < (os.cpu_count() or 1):
+            # Too few to pay for worker startup, draw them here on this process's figure
+            rendered = [_render_station_popup(task) for task in pending.values()]
+        else:
+            # Each station's plot is independent, so render them across processes
+            rendered = list(self._get_popup_pool().map(_render_station_popup, pending.values()))
+        self._popup_cache.update(zip(pending, rendered))
+        popup_htmls = [self._popup_cache[key] for key in keys]
+
+        popups = [[] for _ in frames]
+        for (frame_idx, lat, lon), popup_html in zip(stations, popup_htmls):
+            popups[frame_idx].append((lat, lon, popup_html))
+        return popups
+
+    def _get_popup_pool(self):
+        """Return the popup process pool, starting it on first use.
+
+        Workers are spawned rather than forked, since forking after Arrow has started its
+        threads can deadlock; spawn is also what macOS and Windows use.
+        """
+        if self._popup_pool is None:
+            self._popup_pool = ProcessPoolExecutor(mp_context=multiprocessing.get_context('spawn'))
+            # Shut the workers down with the Visualizer even if close() is never called
+            self._popup_pool_finalizer = weakref.finalize(self, self._popup_pool.shutdown)
+        return self._popup_pool
+
+    def close(self):
+        """Shut down the popup process pool, if one was started."""
+        if self._popup_pool is not None:
+            self._popup_pool_finalizer()
+            self._popup_pool = None
+            self._popup_pool_finalizer = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+
+    def _add_station_markers(self, m, station_popups, color):
+        """Add a circle marker with its time series popup for each (lat, lon, popup_html).
+
+        All stations go into one GeoJson layer, so the map gets one child and one
+        template render instead of a CircleMarker, Popup and IFrame per station.
+        """
+        if not station_popups:
+            return
+        features = [
+            {
                 "type": "Feature",
-                "geometry": {
-                    "type": "Point",
-                    "coordinates": [float(row['Longitude']), float(row['Latitude'])]
-                },
-                "properties": {
-                    "time": time_str,
-                    "popup": f"{station_name}<br>PM2.5 AQI: {row['AQI']} ({row.get('AQI_Category', 'Unknown')}) on {time_str}",
-                    "icon": "circle",
-                    "iconstyle": {
-                        "fillColor": color,
-                        "fillOpacity": 0.8,
-                        "stroke": False,
-                        "radius": 5
-                    }
-                }
+                "geometry": {"type": "Point", "coordinates": [float(lon), float(lat)]},
+                "properties": {"popup": f'<div style="width:500px;">{popup_html}</div>'}
             }
-            features.append(feature)
+            for lat, lon, popup_html in station_popups
+        ]
+        folium.GeoJson(
+            {"type": "FeatureCollection", "features": features},
+            marker=folium.CircleMarker(radius=6, color=color, fill=True, fill_color="black", fill_opacity=0.5),
+            popup=folium.GeoJsonPopup(fields=["popup"], labels=False, max_width=600),
+        ).add_to(m)
 
-        # Ozone
-        for idx, row in filtered_ozone.iterrows():
-            try:
-                date_obj = pd.to_datetime(row['Date']).replace(day=1)
-            except Exception:
-                continue
-            time_str = date_obj.isoformat()
-            color = aqi_color_map.get(row.get('AQI_Category', "Unknown"), "#000000")
-            station_name = get_station_name(row)
-            feature = {
+    def add_static_aqi_station_markers(self, m, filtered_pm25, filtered_ozone):
+        """Add static circle markers for AQI stations with time series popups."""
+        pm25_popups, ozone_popups = self._station_popups([filtered_pm25, filtered_ozone])
+        self._add_station_markers(m, pm25_popups, "blue")
+        self._add_station_markers(m, ozone_popups, "green")
+
+    def _month_times(self, df):
+        """Return a mask of rows with a valid Date and their month-start ISO timestamps."""
+        month_start = df['Date'].values.astype('datetime64[M]').astype('datetime64[ns]')
+        valid = ~np.isnat(month_start)
+        # Format each distinct month once and broadcast back by code
+        codes, months = pd.factorize(month_start[valid])
+        return valid, np.datetime_as_string(months, unit='s')[codes]
+
+    def _aqi_features(self, df, parameter, popup_day=False):
+        """Build monthly TimestampedGeoJson point features from an AQI frame.
+
+        Popups end with the month start, or with the reading's own date when popup_day is set.
+        """
+        valid, times = self._month_times(df)
+        # tolist() hands back Python floats, so the dicts below need no per-point float()
+        lats = np.round(df['Latitude'].to_numpy(dtype=np.float64)[valid], 5).tolist()
+        lons = np.round(df['Longitude'].to_numpy(dtype=np.float64)[valid], 5).tolist()
+        aqis = df['AQI'].to_numpy()[valid]
+        # AQI_Category is a categorical over aqi_color_map's keys, so its codes index both tables
+        if 'AQI_Category' in df:
+            category_codes = df['AQI_Category'].cat.codes.to_numpy()[valid]
+        else:
+            category_codes = np.full(len(lats), list(aqi_color_map).index("Unknown"))
+        categories = np.array(list(aqi_color_map))[category_codes]
+        colors = np.array(list(aqi_color_map.values()))[category_codes]
+        if 'SiteName' in df:
+            sites = df['SiteName'].to_numpy()[valid]
+        else:
+            sites = [f"Station at ({lat}, {lon})" for lat, lon in zip(lats, lons)]
+        popup_dates = np.datetime_as_string(df['Date'].values[valid], unit='D') if popup_day else times
+        return [
+            {
                 "type": "Feature",
                 "geometry": {
                     "type": "Point",
-                    "coordinates": [float(row['Longitude']), float(row['Latitude'])]
+                    "coordinates": [lon, lat]
                 },
                 "properties": {
                     "time": time_str,
-                    "popup": f"{station_name}<br>Ozone AQI: {row['AQI']} ({row.get('AQI_Category', 'Unknown')}) on {time_str}",
+                    "popup": f"{site}<br>{parameter} AQI: {aqi} ({category}) on {popup_date}",
                     "icon": "circle",
                     "iconstyle": {
                         "fillColor": color,
@@ -211,14 +507,21 @@ class Visualizer:
                     }
                 }
             }
-            features.append(feature)
+            for lat, lon, aqi, category, color, site, time_str, popup_date
+            in zip(lats, lons, aqis, categories, colors, sites, times, popup_dates)
+        ]
+
+    def add_animated_aqi_markers(self, m, filtered_pm25, filtered_ozone):
+        """Add animated AQI markers using TimestampedGeoJson (monthly)."""
+        features = self._aqi_features(filtered_pm25, "PM2.5") + self._aqi_features(filtered_ozone, "Ozone")
 
         aqi_geojson = {
             "type": "FeatureCollection",
             "features": features
         }
+        # Serialize compactly ourselves; TimestampedGeoJson embeds strings as given
         ts_aqi = TimestampedGeoJson(
-            aqi_geojson,
+            json.dumps(aqi_geojson, separators=(',', ':')),
             period="P1M", 
             transition_time=200,
             auto_play=False,
@@ -228,16 +531,17 @@ class Visualizer:
         )
         ts_aqi.add_to(m)
 
+    @_reuse_built_map
     def create_static_map(self, year_filter=None):
         """Existing static map example with a full-year heatmap + static stations."""
         try:
             self.logger.info("Creating the static map.")
-            m = folium.Map(location=[39.5501, -105.7821], zoom_start=6, tiles='cartodbpositron')
+            m = folium.Map(location=[39.5501, -105.7821], zoom_start=6, tiles='cartodbpositron', prefer_canvas=True)
 
             if year_filter:
-                filtered_wildfires = self.wildfire_data[self.wildfire_data["Date"].str.startswith(str(year_filter))]
-                filtered_pm25 = self.aqi_pm25[self.aqi_pm25["Date"].str.startswith(str(year_filter))]
-                filtered_ozone = self.aqi_ozone[self.aqi_ozone["Date"].str.startswith(str(year_filter))]
+                filtered_wildfires = self._year_slice(self.wildfire_data, self._wildfire_dates, year_filter)
+                filtered_pm25 = self._year_slice(self.aqi_pm25, self._pm25_dates, year_filter)
+                filtered_ozone = self._year_slice(self.aqi_ozone, self._ozone_dates, year_filter)
             else:
                 filtered_wildfires = self.wildfire_data
                 filtered_pm25 = self.aqi_pm25
@@ -257,22 +561,24 @@ class Visualizer:
 
             year_suffix = f"_{year_filter}" if year_filter else ""
             map_path = os.path.join(self.output_dir, f"static_map{year_suffix}.html")
-            m.save(map_path)
-            self.logger.info(f"Static map saved to {map_path}.")
+            saved_path = self._save_map(m, map_path)
+            self.logger.info(f"Static map saved to {saved_path}.")
+            return m, saved_path
         except Exception as e:
             self.logger.error(f"Error creating static map: {e}")
             raise
 
+    @_reuse_built_map
     def create_animated_map(self, year_filter=None):
         """Existing map with monthly wildfire heatmap + optional monthly AQI markers."""
         try:
             self.logger.info("Creating the animated map.")
-            m = folium.Map(location=[39.5501, -105.7821], zoom_start=6, tiles='cartodbpositron')
+            m = folium.Map(location=[39.5501, -105.7821], zoom_start=6, tiles='cartodbpositron', prefer_canvas=True)
 
             if year_filter:
-                filtered_wildfires = self.wildfire_data[self.wildfire_data["Date"].str.startswith(str(year_filter))]
-                filtered_pm25 = self.aqi_pm25[self.aqi_pm25["Date"].str.startswith(str(year_filter))]
-                filtered_ozone = self.aqi_ozone[self.aqi_ozone["Date"].str.startswith(str(year_filter))]
+                filtered_wildfires = self._year_slice(self.wildfire_data, self._wildfire_dates, year_filter)
+                filtered_pm25 = self._year_slice(self.aqi_pm25, self._pm25_dates, year_filter)
+                filtered_ozone = self._year_slice(self.aqi_ozone, self._ozone_dates, year_filter)
             else:
                 filtered_wildfires = self.wildfire_data
                 filtered_pm25 = self.aqi_pm25
@@ -287,12 +593,14 @@ class Visualizer:
             folium.LayerControl(collapsed=False).add_to(m)
             year_suffix = f"_{year_filter}" if year_filter else ""
             map_path = os.path.join(self.output_dir, f"animated_map{year_suffix}.html")
-            m.save(map_path)
-            self.logger.info(f"Animated map saved to {map_path}.")
+            saved_path = self._save_map(m, map_path)
+            self.logger.info(f"Animated map saved to {saved_path}.")
+            return m, saved_path
         except Exception as e:
             self.logger.error(f"Error creating animated map: {e}")
             raise
 
+    @_reuse_built_map
     def create_monthly_map(self, year_filter=None):
         """
         Unifies wildfires, PM2.5, and Ozone data into a single TimestampedGeoJson
@@ -304,13 +612,13 @@ class Visualizer:
         """
         try:
             self.logger.info("Creating a single monthly time slider map (unified approach).")
-            m = folium.Map(location=[39.5501, -105.7821], zoom_start=6, tiles='cartodbpositron')
+            m = folium.Map(location=[39.5501, -105.7821], zoom_start=6, tiles='cartodbpositron', prefer_canvas=True)
 
             # 1) Filter data by year if provided
             if year_filter:
-                wf_df = self.wildfire_data[self.wildfire_data["Date"].str.startswith(str(year_filter))]
-                pm25_df = self.aqi_pm25[self.aqi_pm25["Date"].str.startswith(str(year_filter))]
-                ozone_df = self.aqi_ozone[self.aqi_ozone["Date"].str.startswith(str(year_filter))]
+                wf_df = self._year_slice(self.wildfire_data, self._wildfire_dates, year_filter)
+                pm25_df = self._year_slice(self.aqi_pm25, self._pm25_dates, year_filter)
+                ozone_df = self._year_slice(self.aqi_ozone, self._ozone_dates, year_filter)
             else:
                 wf_df = self.wildfire_data
                 pm25_df = self.aqi_pm25
@@ -322,24 +630,22 @@ class Visualizer:
 
             # 2a) Wildfire features (no heatmap, just points). We'll color them red.
             #     Month is the first day of that month for the time slider.
-            for idx, row in wf_df.iterrows():
-                try:
-                    date_obj = pd.to_datetime(row['Date']).replace(day=1)
-                except Exception:
-                    continue
-                time_str = date_obj.isoformat()
-                lat = float(row['latitude'])
-                lon = float(row['longitude'])
+            #     Detections in the same month and ~100 m cell share one feature with a count.
+            valid, times = self._month_times(wf_df)
+            wf_coords = np.round(self._wildfire_coords_of(wf_df)[valid], 3)
+            wf_cells = pd.DataFrame({'time': times, 'lat': wf_coords[:, 0], 'lon': wf_coords[:, 1]})
+            wf_counts = wf_cells.groupby(['time', 'lat', 'lon'], sort=False).size()
+            for (time_str, lat, lon), count in wf_counts.items():
                 # Build the feature
                 feat = {
                     "type": "Feature",
                     "geometry": {
                         "type": "Point",
-                        "coordinates": [lon, lat]
+                        "coordinates": [float(lon), float(lat)]
                     },
                     "properties": {
                         "time": time_str,
-                        "popup": f"Wildfire on {row['Date']}",
+                        "popup": f"{count} wildfire{'s' if count > 1 else ''} in {time_str[:7]}",
                         # We can style wildfires as red circle markers
                         "icon": "circle",
                         "iconstyle": {
@@ -353,71 +659,10 @@ class Visualizer:
                 features.append(feat)
 
             # 2b) PM2.5 features
-            def get_station_name(row):
-                return row.get('SiteName', f"Station at ({row['Latitude']}, {row['Longitude']})")
-
-            for idx, row in pm25_df.iterrows():
-                try:
-                    date_obj = pd.to_datetime(row['Date']).replace(day=1)
-                except Exception:
-                    continue
-                time_str = date_obj.isoformat()
-                color = aqi_color_map.get(row.get('AQI_Category', "Unknown"), "#000000")
-                station_name = get_station_name(row)
-                lat = float(row['Latitude'])
-                lon = float(row['Longitude'])
-                feat = {
-                    "type": "Feature",
-                    "geometry": {
-                        "type": "Point",
-                        "coordinates": [lon, lat]
-                    },
-                    "properties": {
-                        "time": time_str,
-                        "popup": f"{station_name}<br>PM2.5 AQI: {row['AQI']} "
-                                f"({row.get('AQI_Category', 'Unknown')}) on {row['Date']}",
-                        "icon": "circle",
-                        "iconstyle": {
-                            "fillColor": color,
-                            "fillOpacity": 0.8,
-                            "stroke": False,
-                            "radius": 5
-                        }
-                    }
-                }
-                features.append(feat)
+            features += self._aqi_features(pm25_df, "PM2.5", popup_day=True)
 
             # 2c) Ozone features
-            for idx, row in ozone_df.iterrows():
-                try:
-                    date_obj = pd.to_datetime(row['Date']).replace(day=1)
-                except Exception:
-                    continue
-                time_str = date_obj.isoformat()
-                color = aqi_color_map.get(row.get('AQI_Category', "Unknown"), "#000000")
-                station_name = get_station_name(row)
-                lat = float(row['Latitude'])
-                lon = float(row['Longitude'])
-                feat = {
-                    "type": "Feature",
-                    "geometry": {
-                        "type": "Point",
-                        "coordinates": [lon, lat]
-                    },
-                    "properties": {
-                        "time": time_str,
-                        "popup": f"{station_name}<br>Ozone AQI: {row['AQI']} "
-                                f"({row.get('AQI_Category', 'Unknown')}) on {row['Date']}",
-                        "icon": "circle",
-                        "iconstyle": {
-                            "fillColor": color,
-                            "fillOpacity": 0.8,
-                            "stroke": False,
-                            "radius": 5
-                        }
-                    }
-                }
-                features.append(feat)
+            features += self._aqi_features(ozone_df, "Ozone", popup_day=True)
 
             # 3) Build a single FeatureCollection
             all_geojson = {
@@ -427,7 +672,7 @@ class Visualizer:
 
             # 4) Create the TimestampedGeoJson layer
             ts_layer = TimestampedGeoJson(
-                data=all_geojson,
+                data=json.dumps(all_geojson, separators=(',', ':')),
                 period="P1M",          # Step by month
                 transition_time=200,   # Transition speed
                 auto_play=False,
@@ -444,12 +689,14 @@ class Visualizer:
             # 6) Save the map
             year_suffix = f"_{year_filter}" if year_filter else ""
             map_path = os.path.join(self.output_dir, f"unified_monthly_map{year_suffix}.html")
-            m.save(map_path)
-            self.logger.info(f"Monthly unified map saved to {map_path}.")
+            saved_path = self._save_map(m, map_path)
+            self.logger.info(f"Monthly unified map saved to {saved_path}.")
+            return m, saved_path
         except Exception as e:
             self.logger.error(f"Error creating monthly map: {e}")
             raise
 
+    @_reuse_built_map
     def create_seasonal_map(self, year_filter=None):
         """
         Creates a map with one FeatureGroup per season, each containing:
@@ -460,21 +707,15 @@ class Visualizer:
         """
         try:
             self.logger.info("Creating a seasonal toggle map (heatmap + station markers).")
-            m = folium.Map(location=[39.5501, -105.7821], zoom_start=6, tiles='cartodbpositron')
+            m = folium.Map(location=[39.5501, -105.7821], zoom_start=6, tiles='cartodbpositron', prefer_canvas=True)
 
             # -------------------------------------------------------
             # 1) Filter Data by Year (Optional)
             # -------------------------------------------------------
             if year_filter:
-                wf_df = self.wildfire_data[
-                    self.wildfire_data["Date"].str.startswith(str(year_filter))
-                ]
-                pm25_df = self.aqi_pm25[
-                    self.aqi_pm25["Date"].str.startswith(str(year_filter))
-                ]
-                ozone_df = self.aqi_ozone[
-                    self.aqi_ozone["Date"].str.startswith(str(year_filter))
-                ]
+                wf_df = self._year_slice(self.wildfire_data, self._wildfire_dates, year_filter)
+                pm25_df = self._year_slice(self.aqi_pm25, self._pm25_dates, year_filter)
+                ozone_df = self._year_slice(self.aqi_ozone, self._ozone_dates, year_filter)
             else:
                 wf_df = self.wildfire_data
                 pm25_df = self.aqi_pm25
@@ -484,14 +725,10 @@ class Visualizer:
             # 2) Filter by Season - We assume a "Season" column exists
             # -------------------------------------------------------
             # If needed, convert "Season" to a string. E.g. df["Season"] = df["Season"].astype(str)
-            wf_df = wf_df.copy()
-            pm25_df = pm25_df.copy()
-            ozone_df = ozone_df.copy()
-
             # Drop rows missing the Season column if that can happen
-            wf_df.dropna(subset=["Season"], inplace=True)
-            pm25_df.dropna(subset=["Season"], inplace=True)
-            ozone_df.dropna(subset=["Season"], inplace=True)
+            wf_df = wf_df[wf_df["Season"].notna()]
+            pm25_df = pm25_df[pm25_df["Season"].notna()]
+            ozone_df = ozone_df[ozone_df["Season"].notna()]
 
             # Get unique seasons across all data
             all_seasons = pd.concat([wf_df["Season"], pm25_df["Season"], ozone_df["Season"]]).unique()
@@ -500,61 +737,44 @@ class Visualizer:
             # Then sort based on that. Otherwise, just sort alphabetically:
             sorted_seasons = sorted(all_seasons)
 
+            # Split every frame by season once; the loop below only looks groups up.
+            # Wildfire coordinates were already NaN-filtered at load
+            wf_coords = self._wildfire_coords_of(wf_df)
+            wf_rows_by_season = wf_df.groupby("Season").indices
+            pm25_by_season = dict(list(pm25_df.groupby("Season")))
+            ozone_by_season = dict(list(ozone_df.groupby("Season")))
+
             # -------------------------------------------------------
             # 3) For Each Season, Create a FeatureGroup
             # -------------------------------------------------------
-            for season_name in sorted_seasons:
-                # Filter each DF to this season
-                wf_season = wf_df[wf_df["Season"] == season_name]
-                pm25_season = pm25_df[pm25_df["Season"] == season_name]
-                ozone_season = ozone_df[ozone_df["Season"] == season_name]
-
+            # Render every season's station popups up front in one process pool,
+            # two frames (PM2.5, Ozone) per season
+            station_popups = self._station_popups([
+                frame
+                for season_name in sorted_seasons
+                for frame in (pm25_by_season.get(season_name, pm25_df.iloc[:0]),
+                              ozone_by_season.get(season_name, ozone_df.iloc[:0]))
+            ])
+            for i, season_name in enumerate(sorted_seasons):
                 # Create a FeatureGroup for that season
                 fg_season = folium.FeatureGroup(name=f"{season_name} Season", overlay=True)
 
                 # 3a) Wildfire Heatmap
-                coords = wf_season[["latitude","longitude"]].dropna().values.tolist()
-                coords = [[float(lat), float(lon)] for lat, lon in coords]
-                if coords:
+                coords = wf_coords[wf_rows_by_season.get(season_name, [])]
+                if len(coords):
                     HeatMap(
-                        coords,
+                        _binned_heat_data(coords),
                         radius=15,
                         blur=10,
                         gradient={"0.2": "yellow", "0.4": "orange", "0.6": "red"}
                     ).add_to(fg_season)
 
                 # 3b) PM2.5 Station Markers (Seasonal)
-                grouped_pm25 = pm25_season.groupby(["SiteName","Latitude","Longitude"])
-                for (site, lat, lon), group in grouped_pm25:
-                    # We pass only that season's data to generate_time_series_html
-                    popup_html = self.generate_time_series_html(group.copy(), station_name=site)
-                    iframe = folium.IFrame(html=popup_html, width=500, height=400)
-                    popup = folium.Popup(iframe, max_width=600)
-                    folium.CircleMarker(
-                        location=[float(lat), float(lon)],
-                        radius=6,
-                        color="blue",
-                        fill=True,
-                        fill_color="black",
-                        fill_opacity=0.5,
-                        popup=popup
-                    ).add_to(fg_season)
+                #     Each popup time series only covers that season's data
+                self._add_station_markers(fg_season, station_popups[2 * i], "blue")
 
                 # 3c) Ozone Station Markers (Seasonal)
-                grouped_ozone = ozone_season.groupby(["SiteName","Latitude","Longitude"])
-                for (site, lat, lon), group in grouped_ozone:
-                    popup_html = self.generate_time_series_html(group.copy(), station_name=site)
-                    iframe = folium.IFrame(html=popup_html, width=500, height=400)
-                    popup = folium.Popup(iframe, max_width=600)
-                    folium.CircleMarker(
-                        location=[float(lat), float(lon)],
-                        radius=6,
-                        color="green",
-                        fill=True,
-                        fill_color="black",
-                        fill_opacity=0.5,
-                        popup=popup
-                    ).add_to(fg_season)
+                self._add_station_markers(fg_season, station_popups[2 * i + 1], "green")
 
                 # Add the season FeatureGroup to the map
                 fg_season.add_to(m)
@@ -569,13 +789,14 @@ class Visualizer:
             # -------------------------------------------------------
             year_suffix = f"_{year_filter}" if year_filter else ""
             map_path = os.path.join(self.output_dir, f"seasonal_map{year_suffix}.html")
-            m.save(map_path)
-            self.logger.info(f"Seasonal map saved to {map_path}.")
-            return m
+            saved_path = self._save_map(m, map_path)
+            self.logger.info(f"Seasonal map saved to {saved_path}.")
+            return m, saved_path
         except Exception as e:
             self.logger.error(f"Error creating seasonal map: {e}")
             raise
 
+    @_reuse_built_map
     def create_animated_wf_map(self, year_filter=None):
         """
         Creates a single animated wildfire heatmap for the specified year (monthly).
@@ -589,7 +810,7 @@ class Visualizer:
 
             # 2) If user provided a year filter, reduce the wildfire data
             if year_filter:
-                filtered_wildfires = self.wildfire_data[self.wildfire_data["Date"].str.startswith(str(year_filter))]
+                filtered_wildfires = self._year_slice(self.wildfire_data, self._wildfire_dates, year_filter)
             else:
                 filtered_wildfires = self.wildfire_data
 
@@ -602,30 +823,19 @@ class Visualizer:
             # 5) Save the map
             year_suffix = f"_{year_filter}" if year_filter else ""
             map_path = os.path.join(self.output_dir, f"animated_wildfire_heatmap{year_suffix}.html")
-            m.save(map_path)
-            self.logger.info(f"Animated wildfire heatmap map saved to {map_path}.")
-            return m
+            saved_path = self._save_map(m, map_path)
+            self.logger.info(f"Animated wildfire heatmap map saved to {saved_path}.")
+            return m, saved_path
         except Exception as e:
             self.logger.error(f"Error creating animated wildfire map: {e}")
             raise
 
 if __name__ == "__main__":
-    # Define color map for your AQI_Category
-    aqi_color_map = {
-        "Good": "#00e400",
-        "Moderate": "#ffff00",
-        "Unhealthy for Sensitive Groups": "#ff7e00",
-        "Unhealthy": "#ff0000",
-        "Very Unhealthy": "#8f3f97",
-        "Hazardous": "#7e0023",
-        "Unknown": "#000000"
-    }
-
     ozone_dp = "data/aqi_data/aqi_processed/ozone_aqi_2019_2024.csv"
     pm25_dp = "data/aqi_data/aqi_processed/pm25_aqi_2019_2024.csv"
     wildfire_dp = "data/wildfire_data/wildfire_processed/wildfire_processed_2019_2024_n.csv"
 
-    visualizer = Visualizer(aqi_pm25_path=pm25_dp, aqi_ozone_path=ozone_dp, wildfire_data_path=wildfire_dp)
-    # Just call create_monthly_map with a year filter to see combined monthly data.
-    #visualizer.create_seasonal_map(year_filter=2020)
-    visualizer.create_animated_wf_map(year_filter=2020)
+    with Visualizer(aqi_pm25_path=pm25_dp, aqi_ozone_path=ozone_dp, wildfire_data_path=wildfire_dp) as visualizer:
+        # Just call create_monthly_map with a year filter to see combined monthly data.
+        #visualizer.create_seasonal_map(year_filter=2020)
+        visualizer.create_animated_wf_map(year_filter=2020)
@@ -0,0 +1,23 @@
+import os
+import sys
+
+import pandas as pd
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "src"))
+
+from aqi_wf_processor import season_of_month
+
+
+def test_season_of_month_maps_each_month():
+    months = pd.Series(range(1, 13))
+    expected = ['Winter', 'Winter', 'Spring', 'Spring', 'Spring', 'Summer',
+                'Summer', 'Summer', 'Fall', 'Fall', 'Fall', 'Winter']
+    assert list(season_of_month(months)) == expected
+
+
+def test_season_of_month_leaves_missing_dates_empty():
+    dates = pd.to_datetime(pd.Series(["2020-12-15", None, "2020-07-04"]))
+    seasons = season_of_month(dates.dt.month)
+    assert seasons[0] == 'Winter'
+    assert pd.isna(seasons[1])
+    assert seasons[2] == 'Summer'